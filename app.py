@@ -1,4 +1,11 @@
+import contextlib
+import hashlib
+import io
+import os
+import re
+import requests
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -7,9 +14,12 @@ from datetime import datetime, timedelta
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="Nebula Quantum Analytics", page_icon="🌌", layout="wide")
 
+# Sessions share one cached base frame; Copy-on-Write keeps it safe from per-session edits (always on in pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # --- CUSTOM GALAXY THEME & UI ---
-st.markdown("""
-    <style>
+NEBULA_CSS = """
     @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700&display=swap');
 
     .stApp {
@@ -59,38 +69,332 @@ st.markdown("""
         -webkit-text-fill-color: transparent;
         font-weight: bold;
     }
-    </style>
-    """, unsafe_allow_html=True)
+    """
+
+@st.cache_resource
+def theme_html(css):
+    # Streamlit drops elements a rerun doesn't re-emit, so the theme is sent every run; build the
+    # minified tag once per process and hand back the same string instead of an unpickled copy
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css).strip()
+    return f"<style>{css}</style>"
+
+st.markdown(theme_html(NEBULA_CSS), unsafe_allow_html=True)
 
 # --- DATA ENGINE ---
 DEFAULT_SHEET_URL = "https://docs.google.com/spreadsheets/d/1Qk8U4Gx4Zxxb-sTYeCSnMbCz31a2WJiLUMYIsjAcTDY/export?format=csv"
+# Cleaned sheets are kept as Parquet keyed by content hash, so restarts skip CSV parsing
+PARQUET_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# Bump whenever clean_dataframe's output changes; files written under older rules are then ignored and pruned
+PARQUET_CACHE_REV = 3
+# Label columns kept alongside the auto-detected date/price pair; anything else is skipped at parse time
+LABEL_COLS = ('Trend', 'Day')
+# Low-cardinality labels stored as small integer codes instead of Python strings
+CATEGORICAL_COLS = ('Trend', 'Day')
+
+def to_categoricals(df):
+    for c in CATEGORICAL_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype('category').cat.remove_unused_categories()
+    return df
+
+# Known sheet date layouts, tried on the fast strptime path before per-value inference
+DATE_FORMATS = ('%b %d %Y', '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y')
+
+def parse_dates(s):
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    for fmt in DATE_FORMATS:
+        parsed = pd.to_datetime(s, format=fmt, errors='coerce', cache=True)
+        if parsed.notna().sum() == s.notna().sum():
+            return parsed
+    return pd.to_datetime(s, format='mixed', errors='coerce', cache=True)
+
+_DATE_RE = re.compile(r'date', re.I)
+_PRICE_RE = re.compile(r'price', re.I)
+
+@st.cache_data(show_spinner=False)
+def detect_columns(cols):
+    # Keyed on the header tuple, so every loader and page reuses one scan per sheet layout
+    d_col = next((c for c in cols if _DATE_RE.search(c)), None)
+    p_col = next((c for c in cols if _PRICE_RE.search(c)), None)
+    if d_col is None or p_col is None:
+        raise ValueError(f"Expected a date and a price column, found: {', '.join(cols)}")
+    return d_col, p_col
 
 def clean_dataframe(df):
-    df.columns = [str(c).strip() for c in df.columns]
-    # Find Price Column
-    p_col = [c for c in df.columns if 'Price' in c or 'price' in c][0]
-    if df[p_col].dtype == 'object':
-        df[p_col] = df[p_col].astype(str).str.replace('₹', '').str.replace(',', '').str.strip()
+    df.columns = df.columns.astype(str).str.strip()
+    d_col, p_col = detect_columns(tuple(df.columns))
+    # Clean Price Column
+    if not pd.api.types.is_numeric_dtype(df[p_col]):
+        df[p_col] = df[p_col].astype(str).str.replace(r'[₹,\s]', '', regex=True)
     df[p_col] = pd.to_numeric(df[p_col], errors='coerce')
-    # Find Date Column
-    d_col = [c for c in df.columns if 'Date' in c or 'date' in c][0]
-    df[d_col] = pd.to_datetime(df[d_col], errors='coerce')
-    return df.dropna(subset=[d_col, p_col]).sort_values(d_col), d_col, p_col
+    # Parse Date Column
+    df[d_col] = parse_dates(df[d_col])
+    df = df.dropna(subset=[d_col, p_col]).sort_values(d_col)
+    return to_categoricals(df), d_col, p_col
+
+def wanted_columns(header):
+    return [c for c in header
+            if str(c).strip() in LABEL_COLS or _DATE_RE.search(str(c)) or _PRICE_RE.search(str(c))]
+
+def read_csv_fast(raw, prune=False):
+    # Arrow's multithreaded parser when available, falling back to the C engine on older pandas
+    header = pd.read_csv(io.BytesIO(raw), nrows=0).columns
+    # Only plotted uploads are pruned; the main sheet keeps every column for the ledger and its export
+    usecols = None
+    if prune:
+        # Checked against the full header, so the error lists every column the upload actually has
+        detect_columns(tuple(header.astype(str).str.strip()))
+        usecols = wanted_columns(header)
+    # Label columns are dictionary-encoded by the parser itself, never materialised as strings
+    dtype = {c: 'category' for c in header if str(c).strip() in CATEGORICAL_COLS}
+    try:
+        return pd.read_csv(io.BytesIO(raw), engine='pyarrow', usecols=usecols, dtype=dtype)
+    except (ImportError, ValueError):
+        return pd.read_csv(io.BytesIO(raw), usecols=usecols, dtype=dtype)
+
+@st.cache_data(max_entries=8)
+def load_and_clean(file_bytes):
+    # Keyed on the uploaded bytes, so reruns with the same file skip parsing and cleaning.
+    # In memory only: the disk store never evicts, so persisting would keep every user upload forever
+    return clean_dataframe(read_csv_fast(file_bytes, prune=True))
+
+@st.cache_resource
+def http_session():
+    # One keep-alive session per process so cache misses reuse the TLS connection
+    sess = requests.Session()
+    sess.headers.update({'Accept-Encoding': 'gzip'})
+    return sess
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_csv(url):
+    # Raw sheet bytes, refreshed hourly; failures raise instead of being cached
+    r = http_session().get(url, timeout=10)
+    r.raise_for_status()
+    return r.content
+
+def parquet_cache_tag():
+    # Cleaning rules and the pandas major version are part of the key, not just the sheet bytes
+    rules = (PARQUET_CACHE_REV, LABEL_COLS, CATEGORICAL_COLS, DATE_FORMATS, pd.__version__.split('.')[0])
+    return hashlib.md5(repr(rules).encode()).hexdigest()[:8]
+
+def read_parquet_cache(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except (ImportError, OSError, ValueError):
+        return None
+
+def write_parquet_cache(df, path):
+    # Written beside the target and swapped in atomically; an unwritable disk is only a cache miss
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+        df.to_parquet(tmp, compression='zstd')
+        os.replace(tmp, path)
+    except (ImportError, OSError):
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        return
+    # Only the current sheet revision is worth keeping
+    for name in os.listdir(PARQUET_CACHE_DIR):
+        stale = os.path.join(PARQUET_CACHE_DIR, name)
+        if name.endswith('.parquet') and stale != path:
+            with contextlib.suppress(OSError):
+                os.remove(stale)
+
+@st.cache_resource(max_entries=1)
+def load_sheet(raw):
+    etag = hashlib.md5(raw).hexdigest()
+    path = os.path.join(PARQUET_CACHE_DIR, f"{parquet_cache_tag()}-{etag}.parquet")
+    df = read_parquet_cache(path)
+    if df is not None and not df.empty:
+        return (df, *detect_columns(tuple(df.columns)))
+    df, d_col, p_col = clean_dataframe(read_csv_fast(raw))
+    if not df.empty:
+        write_parquet_cache(df, path)
+    return df, d_col, p_col
 
-@st.cache_data
 def load_data(url):
+    return load_sheet(fetch_csv(url))
+
+@st.cache_data(max_entries=8)
+def trend_mix(df):
+    # Aggregate server-side so the pie ships one row per trend, not per record
+    return df['Trend'].value_counts().rename_axis('Trend').reset_index(name='Count')
+
+@st.cache_data(max_entries=8)
+def daily_prices(df, d, p):
+    dates = df[d]
+    # The sheet usually holds one midnight quote per day, in order; then there is nothing to reduce
+    if dates.is_monotonic_increasing and dates.is_unique and (dates == dates.dt.normalize()).all():
+        return df[[d, p]].reset_index(drop=True)
+    # Daily buckets keyed on the native datetime64 column (no Python date boxing); last quote wins
+    return df.groupby(pd.Grouper(key=d, freq='D'))[p].last().dropna().reset_index()
+
+@st.cache_data(max_entries=8)
+def shade_trend(trend_df, d, p):
+    # Rasterize very long series server-side; None when the optional datashader isn't installed
     try:
-        df = pd.read_csv(url)
-        return clean_dataframe(df)
-    except:
-        return None, None, None
+        import datashader as ds
+        import datashader.transfer_functions as tf
+    except ImportError:
+        return None
+    points = pd.DataFrame({'t': trend_df[d].astype('int64'), 'v': trend_df[p]})
+    agg = ds.Canvas(plot_width=1200, plot_height=400).line(points, 't', 'v')
+    return tf.shade(agg, cmap=['#00d4ff']).to_pil()
+
+@st.cache_data(max_entries=8)
+def unique_prices(prices):
+    # Sorted selectbox options, memoized per price array
+    return np.unique(prices)
+
+@st.cache_data(max_entries=8)
+def to_csv_bytes(df):
+    # Export payload is rebuilt only when the ledger changes; superseded versions are evicted, not hoarded
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(max_entries=8)
+def compute_kpis(prices):
+    # Keyed on the contiguous price array, which hashes far cheaper than the whole ledger frame;
+    # all reductions then run on that one buffer rather than through Series dispatch.
+    curr_price, prev_price = prices[-1], prices[-2]
+    return {
+        'curr': curr_price,
+        'delta': ((curr_price - prev_price)/prev_price)*100,
+        'max': prices.max(),
+        'min': prices.min(),
+        'count': prices.size,
+    }
 
 # --- SESSION STATE INITIALIZATION ---
 if 'main_df' not in st.session_state:
-    df, d_col, p_col = load_data(DEFAULT_SHEET_URL)
+    try:
+        df, d_col, p_col = load_data(DEFAULT_SHEET_URL)
+    except requests.RequestException as e:
+        st.error(f"📡 Could not reach the price sheet: {e}")
+        st.stop()
+    except ValueError as e:
+        st.error(f"📡 The price sheet could not be parsed: {e}")
+        st.stop()
     st.session_state.main_df = df
     st.session_state.d_col = d_col
     st.session_state.p_col = p_col
+if 'pending_rows' not in st.session_state:
+    st.session_state.pending_rows = []
+    st.session_state.merged_df = None
+    st.session_state.sort_idx = None
+
+# Archive entries are buffered and folded into main_df in bulk, not one concat per insert
+PENDING_FLUSH_ROWS = 64
+# Past this many points even WebGL struggles, so the trajectory is rendered as a raster image
+DATASHADER_MIN_POINTS = 50_000
+# Plotly line traces are thinned to this many visually-faithful points before serialisation
+LTTB_POINTS = 1000
+# The ledger shows only the newest page unless the user asks for everything
+LEDGER_PREVIEW_ROWS = 500
+
+def get_df():
+    # The base+buffer view is built once per insert, not on every rerun that reads it
+    pending = st.session_state.pending_rows
+    if not pending:
+        return st.session_state.main_df
+    if st.session_state.merged_df is None:
+        st.session_state.merged_df = pd.concat([st.session_state.main_df, pd.DataFrame(pending)], ignore_index=True)
+    if len(pending) > PENDING_FLUSH_ROWS:
+        st.session_state.main_df = to_categoricals(st.session_state.merged_df)
+        st.session_state.pending_rows = []
+        st.session_state.merged_df = None
+        return st.session_state.main_df
+    return st.session_state.merged_df
+
+# --- FIGURE BUILDERS ---
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: keep the point per bucket that spans the largest triangle
+    # with the previously kept point and the next bucket's centroid
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+def downsample(frame, x, y, n_out=LTTB_POINTS):
+    if len(frame) <= n_out:
+        return frame
+    xs = frame[x].astype('int64').to_numpy(dtype='float64')
+    return frame.iloc[lttb_indices(xs, frame[y].to_numpy(dtype='float64'), n_out)]
+
+# Shared go.Figure objects, never mutated by callers: st.plotly_chart trusts a Figure as validated
+# (a dict would be rebuilt through go.Figure on every rerun) and there is no per-rerun unpickle
+@st.cache_resource(max_entries=8)
+def build_trend_fig(trend_df, d, p):
+    trend_df = downsample(trend_df, d, p)
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=trend_df[d], y=trend_df[p], fill='tozeroy', name='Spot Price',
+                             line=dict(color='#00d4ff', width=3),
+                             fillcolor='rgba(0, 212, 255, 0.1)'))
+    fig.update_layout(template="plotly_dark", title="Silver Price Quantum Trajectory",
+                      paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+                      xaxis=dict(showgrid=False), yaxis=dict(gridcolor='rgba(255,255,255,0.05)'))
+    return fig
+
+@st.cache_resource(max_entries=8)
+def build_pie_fig(mix):
+    fig_pie = px.pie(mix, names='Trend', values='Count', hole=0.7, title="Market Sentiment Mix",
+                    color_discrete_sequence=px.colors.sequential.Electric)
+    fig_pie.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)')
+    return fig_pie
+
+@st.cache_resource(max_entries=8)
+def build_comparison_fig(s1, d1, p1, s2, d2, p2):
+    s1, s2 = downsample(s1, d1, p1), downsample(s2, d2, p2)
+    # WebGL traces: uploaded files can be far longer than the primary sheet
+    fig_comp = go.Figure()
+    fig_comp.add_trace(go.Scattergl(x=s1[d1], y=s1[p1], name="Primary Cloud Data"))
+    fig_comp.add_trace(go.Scattergl(x=s2[d2], y=s2[p2], name="Uploaded Data", line=dict(color='#7b2ff7')))
+    fig_comp.update_layout(template="plotly_dark", title="Cross-Dataset Overlay", paper_bgcolor='rgba(0,0,0,0)')
+    return fig_comp
+
+# --- INTERACTIVE FRAGMENTS ---
+# Calculator inputs rerun only this block, not the theme, sidebar and data loading above it
+@st.fragment
+def quantum_calculator(df, p):
+    with st.container():
+        st.markdown('<div class="stCard">', unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        
+        invest_amt = col1.number_input("Investment Amount (₹)", min_value=100.0, value=10000.0)
+        price_options = unique_prices(df[p].to_numpy())
+        buy_price = col2.selectbox("Select Entry Price (Based on History)", price_options,
+                                   format_func=lambda v: f"₹{v:,.2f}")
+        # Options are sorted, so the peak is the last one; no KPI delta needed (works on a one-row ledger)
+        target_price = col3.number_input("Target Exit Price (₹)", value=float(price_options[-1] * 1.2))
+        
+        # Calculations
+        qty = invest_amt / buy_price
+        current_val = qty * target_price
+        profit = current_val - invest_amt
+        roi = (profit / invest_amt) * 100
+        
+        st.markdown("---")
+        res1, res2, res3 = st.columns(3)
+        res1.metric("Projected Value", f"₹{current_val:,.2f}")
+        res2.metric("Net Profit", f"₹{profit:,.2f}", f"{roi:.2f}%")
+        res3.metric("Silver Qty", f"{qty:.3f} Grams")
+        st.markdown('</div>', unsafe_allow_html=True)
 
 # --- SIDEBAR & LOGO ---
 with st.sidebar:
@@ -105,93 +409,68 @@ with st.sidebar:
     st.subheader("📡 Data Ingestion")
     uploaded_file = st.file_uploader("Upload Secondary CSV", type="csv")
     if uploaded_file:
-        df2, d2, p2 = clean_dataframe(pd.read_csv(uploaded_file))
-        st.session_state.secondary_df = df2
+        try:
+            df2, d2, p2 = load_and_clean(uploaded_file.getvalue())
+            st.session_state.secondary_df = df2
+            st.session_state.secondary_cols = (d2, p2)
+        except ValueError as e:
+            st.error(f"⚠️ Could not read {uploaded_file.name}: {e}")
     
     st.write("System Status: **Optimal** 🟢")
 
 # --- 1. INTELLIGENCE DASHBOARD ---
 if menu == "🚀 Intelligence Dashboard":
     st.title("🌌 Cosmic Market Intelligence")
-    df = st.session_state.main_df
+    df = get_df()
     d, p = st.session_state.d_col, st.session_state.p_col
     
     # KPI SECTION
     k1, k2, k3, k4 = st.columns(4)
-    curr_price = df[p].iloc[-1]
-    prev_price = df[p].iloc[-2]
-    delta = ((curr_price - prev_price)/prev_price)*100
+    kpis = compute_kpis(df[p].to_numpy())
     
-    k1.metric("Current Price", f"₹{curr_price:,.2f}", f"{delta:.2f}%")
-    k2.metric("Galaxy Peak", f"₹{df[p].max():,.2f}")
-    k3.metric("Market Floor", f"₹{df[p].min():,.2f}")
-    k4.metric("Active Cycles", len(df))
+    k1.metric("Current Price", f"₹{kpis['curr']:,.2f}", f"{kpis['delta']:.2f}%")
+    k2.metric("Galaxy Peak", f"₹{kpis['max']:,.2f}")
+    k3.metric("Market Floor", f"₹{kpis['min']:,.2f}")
+    k4.metric("Active Cycles", kpis['count'])
 
     # ADVANCED CHARTS
     col_main, col_side = st.columns([2, 1])
     
     with col_main:
-        # Interactive Neon Area Chart
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=df[d], y=df[p], fill='tozeroy', name='Spot Price',
-                                 line=dict(color='#00d4ff', width=3),
-                                 fillcolor='rgba(0, 212, 255, 0.1)'))
-        fig.update_layout(template="plotly_dark", title="Silver Price Quantum Trajectory",
-                          paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-                          xaxis=dict(showgrid=False), yaxis=dict(gridcolor='rgba(255,255,255,0.05)'))
-        st.plotly_chart(fig, use_container_width=True)
+        # Interactive Neon Area Chart (WebGL keeps long price histories responsive)
+        trend_df = daily_prices(df, d, p)
+        trend_img = shade_trend(trend_df, d, p) if len(trend_df) > DATASHADER_MIN_POINTS else None
+        if trend_img is not None:
+            st.image(trend_img, caption="Silver Price Quantum Trajectory", use_container_width=True)
+        else:
+            st.plotly_chart(build_trend_fig(trend_df, d, p), use_container_width=True)
 
     with col_side:
         # Trend Distribution
         if 'Trend' in df.columns:
-            fig_pie = px.pie(df, names='Trend', hole=0.7, title="Market Sentiment Mix",
-                            color_discrete_sequence=px.colors.sequential.Electric)
-            fig_pie.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(build_pie_fig(trend_mix(df)), use_container_width=True)
 
 # --- 2. COMPARISON LAB ---
 elif menu == "⚖️ Comparison Lab":
     st.title("⚖️ Dimensional Comparison Engine")
     
     if 'secondary_df' in st.session_state:
-        df1 = st.session_state.main_df
-        df2 = st.session_state.secondary_df
-        
-        fig_comp = go.Figure()
-        fig_comp.add_trace(go.Scatter(x=df1[st.session_state.d_col], y=df1[st.session_state.p_col], name="Primary Cloud Data"))
-        fig_comp.add_trace(go.Scatter(x=df2[st.session_state.d_col], y=df2[st.session_state.p_col], name="Uploaded Data", line=dict(color='#7b2ff7')))
-        
-        fig_comp.update_layout(template="plotly_dark", title="Cross-Dataset Overlay", paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_comp, use_container_width=True)
+        d1, p1 = st.session_state.d_col, st.session_state.p_col
+        d2, p2 = st.session_state.secondary_cols
+        # Both sides are collapsed to daily points server-side before Plotly serialises them
+        s1 = daily_prices(get_df(), d1, p1)
+        s2 = daily_prices(st.session_state.secondary_df, d2, p2)
+        st.plotly_chart(build_comparison_fig(s1, d1, p1, s2, d2, p2), use_container_width=True)
     else:
         st.info("ℹ️ Please upload a second CSV in the sidebar to enable dual comparison.")
 
 # --- 3. QUANTUM CALCULATOR (Properly Placed) ---
 elif menu == "🧮 Quantum Calculator":
     st.title("🧮 Investment Quantum Calculator")
-    df = st.session_state.main_df
+    df = get_df()
     p = st.session_state.p_col
     
-    with st.container():
-        st.markdown('<div class="stCard">', unsafe_allow_html=True)
-        col1, col2, col3 = st.columns(3)
-        
-        invest_amt = col1.number_input("Investment Amount (₹)", min_value=100.0, value=10000.0)
-        buy_price = col2.selectbox("Select Entry Price (Based on History)", df[p].unique())
-        target_price = col3.number_input("Target Exit Price (₹)", value=float(df[p].max() * 1.2))
-        
-        # Calculations
-        qty = invest_amt / buy_price
-        current_val = qty * target_price
-        profit = current_val - invest_amt
-        roi = (profit / invest_amt) * 100
-        
-        st.markdown("---")
-        res1, res2, res3 = st.columns(3)
-        res1.metric("Projected Value", f"₹{current_val:,.2f}")
-        res2.metric("Net Profit", f"₹{profit:,.2f}", f"{roi:.2f}%")
-        res3.metric("Silver Qty", f"{qty:.3f} Grams")
-        st.markdown('</div>', unsafe_allow_html=True)
+    quantum_calculator(df, p)
 
 # --- 4. ARCHIVE MANAGER ---
 elif menu == "📁 Archive Manager":
@@ -203,14 +482,22 @@ elif menu == "📁 Archive Manager":
         with st.form("data_entry"):
             c1, c2, c3 = st.columns(3)
             nd = c1.date_input("Date")
-            np = c2.number_input("Price")
+            npr = c2.number_input("Price")
             nt = c3.selectbox("Trend", ["📈 Rising", "📉 Dip", "🔄 Steady", "🚀 Surge"])
             if st.form_submit_button("🚀 Sync to Nebula Cloud"):
-                new_row = pd.DataFrame([{st.session_state.d_col: pd.to_datetime(nd), st.session_state.p_col: np, "Trend": nt}])
-                st.session_state.main_df = pd.concat([st.session_state.main_df, new_row], ignore_index=True)
+                st.session_state.pending_rows.append({st.session_state.d_col: pd.to_datetime(nd), st.session_state.p_col: npr, "Trend": nt})
+                st.session_state.merged_df = None
+                st.session_state.sort_idx = None
                 st.success("Synchronized!")
 
     with tab2:
-        st.dataframe(st.session_state.main_df.sort_values(st.session_state.d_col, ascending=False), use_container_width=True)
-        csv_data = st.session_state.main_df.to_csv(index=False).encode('utf-8')
-        st.download_button("📥 Download Master Ledger", data=csv_data, file_name="Nebula_Data_Export.csv", mime="text/csv")
+        ledger_df = get_df()
+        if st.session_state.sort_idx is None:
+            # Newest-first order over the int64 timestamps, computed once per insert instead of per rerun
+            dates = ledger_df[st.session_state.d_col].astype('int64').to_numpy()
+            st.session_state.sort_idx = np.argsort(dates, kind='stable')[::-1]
+        order = st.session_state.sort_idx
+        if not st.toggle("Show all records"):
+            order = order[:LEDGER_PREVIEW_ROWS]
+        st.dataframe(ledger_df.iloc[order], use_container_width=True)
+        st.download_button("📥 Download Master Ledger", data=to_csv_bytes(ledger_df), file_name="Nebula_Data_Export.csv", mime="text/csv")